@@ -1,44 +1,57 @@
-import json
 import os
+import orjson
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-def main():
-    # Define directories
-    movie_data_dir = Path("movie_data")
-    obfuscated_dir = Path("obfuscated_movie_plot")
+# Define directories
+MOVIE_DATA_DIR = Path("movie_data")
+OBFUSCATED_DIR = Path("obfuscated_movie_plot")
 
-    # Initialize result array
-    movies = []
+def load_pair(movie_file):
+    """Read a movie file and its obfuscated plot, returning the combined data or None."""
+    obfuscated_file = OBFUSCATED_DIR / movie_file.name
 
+    # Check if corresponding obfuscated file exists
+    if not obfuscated_file.exists():
+        return None
+
+    # Combine the data
+    return {**orjson.loads(movie_file.read_bytes()), **orjson.loads(obfuscated_file.read_bytes())}
+
+def main(max_workers=8):
     # Get all JSON files from movie_data directory
-    movie_data_files = list(movie_data_dir.glob("*.json"))
+    movie_data_files = list(MOVIE_DATA_DIR.glob("*.json"))
 
-    for movie_file in movie_data_files:
-        filename = movie_file.name
-        obfuscated_file = obfuscated_dir / filename
+    # Read file pairs in parallel and stream them into db.json as a JSON array. executor.map
+    # submits every file up front, so results that finish early are held until they're written
+    output_file = Path("db.json")
+    # Write to a temp file next to db.json and swap it in only once the array is complete,
+    # so a failure part way through leaves the previous db.json intact
+    tmp_file = output_file.with_name(output_file.name + ".tmp")
+    count = 0
 
-        # Check if corresponding obfuscated file exists
-        if obfuscated_file.exists():
-            # Read both JSON files
-            with open(movie_file, 'r', encoding='utf-8') as f:
-                movie_data = json.load(f)
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor, open(tmp_file, 'wb') as f:
+            f.write(b'[')
 
-            with open(obfuscated_file, 'r', encoding='utf-8') as f:
-                obfuscated_data = json.load(f)
+            for movie_file, combined in zip(movie_data_files, executor.map(load_pair, movie_data_files)):
+                if not combined:
+                    print(f"Warning: No obfuscated file found for {movie_file.name}")
+                    continue
 
-            # Combine the data
-            combined = {**movie_data, **obfuscated_data}
-            movies.append(combined)
-            print(f"Processed: {filename}")
-        else:
-            print(f"Warning: No obfuscated file found for {filename}")
+                if count:
+                    f.write(b',')
+                f.write(orjson.dumps(combined))
+                count += 1
 
-    # Write output to db.json
-    output_file = Path("db.json")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(movies, f, indent=2, ensure_ascii=False)
+            f.write(b']')
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+
+    os.replace(tmp_file, output_file)
 
-    print(f"\nSuccessfully created db.json with {len(movies)} movies")
+    print(f"\nSuccessfully created db.json with {count} movies")
 
 if __name__ == "__main__":
     main()
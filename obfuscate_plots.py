@@ -1,13 +1,44 @@
+import asyncio
 import json
 import os
+import orjson
+import sys
+import time
+import hashlib
+import tempfile
 import anthropic
+from collections import defaultdict
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from tqdm import tqdm
 
-def obfuscate_plot(plot_text, client):
-    """Use Claude to obfuscate a movie plot by removing identifying information."""
+MODEL = "claude-3-5-haiku-20241022"
+MAX_TOKENS = 2000
+
+# How often to check on a submitted message batch
+BATCH_POLL_SECONDS = 30
+
+# Responses are cached on disk keyed by model + prompt, so re-runs don't pay for the same call twice
+CACHE_DIR = Path(".obfuscate_cache")
+
+# A submitted batch is recorded here until its results are saved, so an interrupted run can resume it
+PENDING_BATCH_FILE = CACHE_DIR / "pending_batch.json"
+
+def get_cache_path(prompt):
+    """Get the cache file for a prompt, bucketed by the first 2 hex chars of its key."""
+    key = hashlib.sha256(json.dumps({"model": MODEL, "prompt": prompt}, sort_keys=True).encode()).hexdigest()
+    return CACHE_DIR / key[:2] / f"{key}.txt"
+
+def write_cache(cache_path, text):
+    """Atomically write a cached response (tmpfile + rename)."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, cache_path)
 
-    prompt = f"""Please rewrite the following movie plot by removing all unique proper nouns and identifying features, but keep the general plotline the same.
+def build_prompt(plot_text):
+    """Build the prompt asking Claude to obfuscate a movie plot."""
+    return f"""Please rewrite the following movie plot by removing all unique proper nouns and identifying features, but keep the general plotline the same.
 
 Rules:
 - Replace character names with generic pseudonyms (e.g., "John", "Sarah", "Detective Smith")
@@ -23,52 +54,93 @@ Original plot:
 
 Obfuscated plot:"""
 
-    message = client.messages.create(
-        model="claude-3-5-haiku-20241022",
-        max_tokens=2000,
+async def obfuscate_plot(plot_text, client):
+    """Use Claude to obfuscate a movie plot by removing identifying information."""
+    prompt = build_prompt(plot_text)
+
+    # Return the cached response if we've already made this exact call.
+    # File I/O runs in a worker thread so it doesn't block the other coroutines
+    cache_path = get_cache_path(prompt)
+    if await asyncio.to_thread(cache_path.exists):
+        return await asyncio.to_thread(cache_path.read_text, encoding='utf-8')
+
+    message = await client.messages.create(
+        model=MODEL,
+        max_tokens=MAX_TOKENS,
         messages=[
             {"role": "user", "content": prompt}
         ]
     )
 
-    return message.content[0].text.strip()
+    obfuscated = message.content[0].text.strip()
+    await asyncio.to_thread(write_cache, cache_path, obfuscated)
 
-def process_single_file(json_file, output_dir, client):
-    """Process a single movie file."""
-    try:
-        # Check if already processed
-        output_file = Path(output_dir) / json_file.name
-        if output_file.exists():
-            return {'status': 'skipped', 'file': json_file.name}
+    return obfuscated
 
-        # Read original JSON
-        with open(json_file, 'r', encoding='utf-8') as f:
-            movie_data = json.load(f)
+def save_obfuscated_plot(output_file, obfuscated):
+    """Save an obfuscated plot to its output JSON file."""
+    # Create new JSON with only obfuscated_plot
+    output_data = {
+        'obfuscated_plot': obfuscated
+    }
 
-        # Get plot
-        plot = movie_data.get('plot')
-        if not plot:
-            return {'status': 'no_plot', 'file': json_file.name}
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
 
-        # Obfuscate plot
-        obfuscated = obfuscate_plot(plot, client)
+def group_files_by_plot(json_files, output_dir):
+    """Read the movie files that still need work and group them by a hash of their plot."""
+    groups = defaultdict(list)
+    plots = {}
+    skipped = 0
+    no_plot = []
+    errors = []
 
-        # Create new JSON with only obfuscated_plot
-        output_data = {
-            'obfuscated_plot': obfuscated
-        }
+    for json_file in json_files:
+        try:
+            # Check if already processed
+            output_file = Path(output_dir) / json_file.name
+            if output_file.exists():
+                skipped += 1
+                continue
+
+            # Read original JSON
+            with open(json_file, 'r', encoding='utf-8') as f:
+                movie_data = json.load(f)
+
+            # Get plot
+            plot = movie_data.get('plot')
+            if not plot:
+                no_plot.append(json_file.name)
+                continue
+
+            # Identical plots only need to be obfuscated once
+            key = hashlib.sha256(plot.encode()).hexdigest()
+            plots[key] = plot
+            groups[key].append(json_file)
+
+        except Exception as e:
+            errors.append(f"Error processing {json_file.name}: {e}")
+
+    return {key: (plots[key], files) for key, files in groups.items()}, skipped, no_plot, errors
+
+async def process_plot_group(plot, json_files, output_dir, client):
+    """Obfuscate one plot and save it for every movie file that shares it."""
+    names = [json_file.name for json_file in json_files]
 
-        # Save to output directory
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+    try:
+        # Obfuscate plot
+        obfuscated = await obfuscate_plot(plot, client)
+
+        for json_file in json_files:
+            await asyncio.to_thread(save_obfuscated_plot, Path(output_dir) / json_file.name, obfuscated)
 
-        return {'status': 'success', 'file': json_file.name}
+        return {'status': 'success', 'files': names}
 
     except Exception as e:
-        return {'status': 'error', 'file': json_file.name, 'error': str(e)}
+        return {'status': 'error', 'files': names, 'error': str(e)}
 
-def process_movie_files(input_dir='movie_data', output_dir='obfuscated_movie_plot', max_workers=10):
-    """Process all JSON files in the movie_data directory in parallel."""
+async def obfuscate_movie_files(input_dir, output_dir, max_workers):
+    """Process all JSON files in the movie_data directory concurrently on one event loop."""
 
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
@@ -78,42 +150,44 @@ def process_movie_files(input_dir='movie_data', output_dir='obfuscated_movie_plo
     if not api_key:
         raise ValueError("ANTHROPIC_API_KEY environment variable not set")
 
-    client = anthropic.Anthropic(api_key=api_key)
-
     # Get all JSON files
     input_path = Path(input_dir)
     json_files = list(input_path.glob('*.json'))
 
     print(f"Found {len(json_files)} JSON files to process")
-    print(f"Using {max_workers} parallel workers\n")
+    print(f"Using {max_workers} concurrent requests\n")
 
     processed = 0
-    skipped = 0
-    errors = []
 
-    # Process files in parallel
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        future_to_file = {
-            executor.submit(process_single_file, json_file, output_dir, client): json_file
-            for json_file in json_files
-        }
+    groups, skipped, no_plot, errors = group_files_by_plot(json_files, output_dir)
+    for filename in no_plot:
+        print(f"⚠ Skipped {filename} (no plot)")
+
+    pending_files = sum(len(files) for plot, files in groups.values())
+    print(f"Skipped {skipped} existing files, "
+          f"deduplicated {pending_files - len(groups)} identical plots, {len(groups)} to obfuscate\n")
+
+    # Close the client's connection pool while the event loop is still running
+    async with anthropic.AsyncAnthropic(api_key=api_key) as client:
+        # Bound the number of in-flight API calls
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def bounded(plot, files):
+            async with semaphore:
+                return await process_plot_group(plot, files, output_dir, client)
 
-        # Process completed tasks
-        for i, future in enumerate(as_completed(future_to_file), 1):
-            result = future.result()
+        # Process unique plots concurrently
+        tasks = [bounded(plot, files) for plot, files in groups.values()]
+
+        # Process completed tasks, with a single progress bar instead of a print per file
+        for task in tqdm(asyncio.as_completed(tasks), total=len(groups)):
+            result = await task
 
             if result['status'] == 'success':
-                print(f"[{i}/{len(json_files)}] ✓ Processed {result['file']}")
-                processed += 1
-            elif result['status'] == 'skipped':
-                print(f"[{i}/{len(json_files)}] ⊘ Skipped {result['file']} (already exists)")
-                skipped += 1
-            elif result['status'] == 'no_plot':
-                print(f"[{i}/{len(json_files)}] ⚠ Skipped {result['file']} (no plot)")
+                processed += len(result['files'])
             elif result['status'] == 'error':
-                error_msg = f"Error processing {result['file']}: {result['error']}"
-                print(f"[{i}/{len(json_files)}] ✗ {error_msg}")
+                error_msg = f"Error processing {', '.join(result['files'])}: {result['error']}"
+                tqdm.write(f"✗ {error_msg}")
                 errors.append(error_msg)
 
     print(f"\n✓ Done! Processed {processed} files, skipped {skipped} files")
@@ -123,5 +197,156 @@ def process_movie_files(input_dir='movie_data', output_dir='obfuscated_movie_plo
         for error in errors:
             print(f"  - {error}")
 
+def process_movie_files(input_dir='movie_data', output_dir='obfuscated_movie_plot', max_workers=50):
+    """Process all JSON files in the movie_data directory concurrently."""
+    asyncio.run(obfuscate_movie_files(input_dir, output_dir, max_workers))
+
+def save_pending_batch(batch_id, pending):
+    """Record a submitted batch and which output files each of its requests belongs to."""
+    record = {
+        'batch_id': batch_id,
+        'requests': {
+            custom_id: {'files': [str(output_file) for output_file in output_files], 'prompt': prompt}
+            for custom_id, (output_files, prompt) in pending.items()
+        }
+    }
+    write_cache(PENDING_BATCH_FILE, orjson.dumps(record).decode())
+
+def load_pending_batch():
+    """Load the batch recorded by an interrupted run, or None if there isn't one."""
+    if not PENDING_BATCH_FILE.exists():
+        return None
+
+    record = orjson.loads(PENDING_BATCH_FILE.read_bytes())
+    pending = {
+        custom_id: ([Path(output_file) for output_file in request['files']], request['prompt'])
+        for custom_id, request in record['requests'].items()
+    }
+    return record['batch_id'], pending
+
+def save_batch_results(client, batch_id, pending):
+    """Wait for a batch to finish, save its results, then forget the recorded batch."""
+    processed = 0
+    errors = []
+
+    # Wait for the batch to finish
+    batch = client.messages.batches.retrieve(batch_id)
+    while batch.processing_status != 'ended':
+        time.sleep(BATCH_POLL_SECONDS)
+        batch = client.messages.batches.retrieve(batch_id)
+        print(f"  Batch {batch_id} is {batch.processing_status}...")
+
+    for result in client.messages.batches.results(batch_id):
+        output_files, prompt = pending[result.custom_id]
+
+        if result.result.type != 'succeeded':
+            error_msg = f"Error processing {', '.join(f.name for f in output_files)}: batch request {result.result.type}"
+            print(f"✗ {error_msg}")
+            errors.append(error_msg)
+            continue
+
+        obfuscated = result.result.message.content[0].text.strip()
+        write_cache(get_cache_path(prompt), obfuscated)
+        for output_file in output_files:
+            save_obfuscated_plot(output_file, obfuscated)
+        processed += len(output_files)
+
+    # Every result is saved, so there is nothing left to resume
+    PENDING_BATCH_FILE.unlink(missing_ok=True)
+
+    return processed, errors
+
+def process_movie_files_batch(input_dir='movie_data', output_dir='obfuscated_movie_plot'):
+    """Process all JSON files in the movie_data directory with a single Message Batches submission."""
+
+    # Create output directory
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Initialize Anthropic client
+    api_key = os.environ.get('ANTHROPIC_API_KEY')
+    if not api_key:
+        raise ValueError("ANTHROPIC_API_KEY environment variable not set")
+
+    client = anthropic.Anthropic(api_key=api_key)
+
+    # Get all JSON files
+    input_path = Path(input_dir)
+    json_files = list(input_path.glob('*.json'))
+
+    print(f"Found {len(json_files)} JSON files to process")
+
+    processed = 0
+    cached = 0
+    errors = []
+
+    # Finish a batch left behind by an interrupted run first, its files are then skipped below
+    pending_batch = load_pending_batch()
+    if pending_batch:
+        batch_id, pending = pending_batch
+        print(f"Resuming batch {batch_id} from {PENDING_BATCH_FILE}")
+        processed, errors = save_batch_results(client, batch_id, pending)
+
+    groups, skipped, no_plot, group_errors = group_files_by_plot(json_files, output_dir)
+    errors.extend(group_errors)
+
+    # Files saved from the resumed batch already count as processed
+    skipped -= processed
+    for filename in no_plot:
+        print(f"⚠ Skipped {filename} (no plot)")
+
+    # Collect the prompts that still need an API call
+    pending = {}
+    for plot, files in groups.values():
+        output_files = [Path(output_dir) / json_file.name for json_file in files]
+
+        # Answer from the cache where we can, without going through the batch
+        prompt = build_prompt(plot)
+        cache_path = get_cache_path(prompt)
+        if cache_path.exists():
+            obfuscated = cache_path.read_text(encoding='utf-8')
+            for output_file in output_files:
+                save_obfuscated_plot(output_file, obfuscated)
+            cached += len(output_files)
+            continue
+
+        # custom_id only allows [a-zA-Z0-9_-], so use an index rather than the filename
+        pending[f"movie-{len(pending)}"] = (output_files, prompt)
+
+    print(f"Skipped {skipped} existing files, used {cached} cached responses, batching {len(pending)} requests\n")
+
+    if pending:
+        batch = client.messages.batches.create(requests=[
+            {
+                "custom_id": custom_id,
+                "params": {
+                    "model": MODEL,
+                    "max_tokens": MAX_TOKENS,
+                    "messages": [
+                        {"role": "user", "content": prompt}
+                    ]
+                }
+            }
+            for custom_id, (output_files, prompt) in pending.items()
+        ])
+        print(f"Submitted batch {batch.id}")
+
+        # Record the batch before waiting on it so its results aren't lost if we're interrupted
+        save_pending_batch(batch.id, pending)
+
+        batch_processed, batch_errors = save_batch_results(client, batch.id, pending)
+        processed += batch_processed
+        errors.extend(batch_errors)
+
+    print(f"\n✓ Done! Processed {processed + cached} files, skipped {skipped} files")
+
+    if errors:
+        print(f"\n⚠ Encountered {len(errors)} errors:")
+        for error in errors:
+            print(f"  - {error}")
+
 if __name__ == "__main__":
-    process_movie_files()
+    # Batches are half price but can take a while to finish, so they are opt-in
+    if '--batch' in sys.argv:
+        process_movie_files_batch()
+    else:
+        process_movie_files()
@@ -1,31 +1,188 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import gzip
+import hashlib
+import httpx
+import importlib.util
+from bs4 import BeautifulSoup, SoupStrainer
+from tqdm import tqdm
 import json
+import orjson
 import os
-import time
-from urllib.parse import urljoin
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import unquote, urljoin
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    # Ask for compressed responses explicitly, httpx can only decode br when brotli is installed
+    'Accept-Encoding': 'gzip, deflate, br' if importlib.util.find_spec('brotli') else 'gzip, deflate'
+}
+
+# Action API used to fetch just the plot section instead of the whole rendered page
+WIKI_API_URL = "https://en.wikipedia.org/w/api.php"
+
+# Sections to look for, in priority order
+PLOT_SECTIONS = ["plot", "synopsis"]
+
+# Only build the parts of each page we actually walk (requires lxml). While parsing, the strainer
+# sees the raw class attribute, so match class tokens to keep e.g. "wikitable sortable"
+NOMINATIONS_STRAINER = SoupStrainer(class_=re.compile(r'\b(wikitable|mw-heading)\b'))
+PLOT_STRAINER = SoupStrainer(['div', 'h2', 'h3', 'p'])
+
+# Stop words that indicate we've reached the statistics section
+STOP_RE = re.compile(
+    r'production companies and distributors with multiple nominations and wins|production company|distributor',
+    re.IGNORECASE
+)
+
+# Year cells look like "2010" or "2010 (83rd)", and year-only cells like "1927/28 (1st)"
+YEAR_RE = re.compile(r'(\d{4})')
+# Only digits, slashes and parentheses, with at least one digit (so "/" or "()" alone don't count)
+NUMERIC_CELL_RE = re.compile(r'^(?=.*\d)[\d/()]+$')
+
+# Characters to strip from titles when building filenames (anything but alphanumerics, space, '-' and '_')
+UNSAFE_FILENAME_RE = re.compile(r'[^\w \-]')
+
+# Stop collecting plot text past this length, longer than any Best Picture plot
+MAX_PLOT_LENGTH = 10_000
+
+# Progress is checkpointed here so a crashed run can pick up where it left off
+CHECKPOINT_DIR = '.scrape_checkpoint'
+NOMINATIONS_CHECKPOINT = os.path.join(CHECKPOINT_DIR, 'nominations.json')
+DONE_CHECKPOINT = os.path.join(CHECKPOINT_DIR, 'done.txt')
+NOMINATIONS_MAX_AGE = timedelta(days=7)
+DONE_FSYNC_EVERY = 10
+
+# Responses are kept here with their ETags so unchanged pages aren't downloaded again
+SCRAPE_CACHE_DIR = '.scrape_cache'
+ETAGS_FILE = os.path.join(SCRAPE_CACHE_DIR, 'etags.json')
+_etags = {}
+
+# Cap outgoing requests to be respectful to Wikipedia servers
+MAX_CONCURRENT_REQUESTS = 8
+REQUESTS_PER_SECOND = 5
+
+# Retry rate limiting and server errors, httpx's transport only retries failed connections
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+MAX_RETRY_DELAY = 60
+
+def create_client():
+    """Create the shared client so every request to Wikipedia reuses pooled HTTP/2 keep-alive connections."""
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+        retries=3
+    )
+    return httpx.AsyncClient(transport=transport, headers=HEADERS, timeout=15)
+
+# Slots are handed back by event loop callbacks that are dropped with the loop,
+# so create a new limiter for every run instead of sharing one at module scope
+class RateLimiter:
+    """Limit in-flight requests and requests per second for a single scraper run."""
+
+    def __init__(self, max_concurrent=MAX_CONCURRENT_REQUESTS, per_second=REQUESTS_PER_SECOND):
+        self.concurrency = asyncio.Semaphore(max_concurrent)
+        self.rate_limit = asyncio.Semaphore(per_second)
+
+    async def wait(self):
+        """Wait until a request slot is free; each slot is handed back one second later."""
+        await self.rate_limit.acquire()
+        asyncio.get_running_loop().call_later(1.0, self.rate_limit.release)
+
+def get_retry_delay(response, attempt):
+    """Get how long to wait before retrying, honouring Retry-After over exponential backoff."""
+    delay = RETRY_BACKOFF * 2 ** attempt
+
+    # Retry-After is either a number of seconds or an HTTP date
+    retry_after = response.headers.get('Retry-After')
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                pass
+
+    return min(max(delay, 0), MAX_RETRY_DELAY)
+
+def load_etags():
+    """Load the URL to ETag mapping saved by previous runs."""
+    if os.path.exists(ETAGS_FILE):
+        with open(ETAGS_FILE, 'rb') as f:
+            _etags.update(orjson.loads(f.read()))
+
+def save_etags():
+    """Save the URL to ETag mapping for the next run."""
+    os.makedirs(SCRAPE_CACHE_DIR, exist_ok=True)
+    with open(ETAGS_FILE, 'wb') as f:
+        f.write(orjson.dumps(_etags))
+
+def get_cached_body_path(url):
+    """Get the file holding the gzip'd body cached for a URL."""
+    return os.path.join(SCRAPE_CACHE_DIR, f"{hashlib.sha1(url.encode()).hexdigest()}.gz")
+
+async def fetch(client, limiter, url, params=None):
+    """Fetch a page from Wikipedia and return its raw body, skipping the download if it hasn't changed."""
+    cache_key = str(httpx.URL(url, params=params))
+    cached_body_path = get_cached_body_path(cache_key)
+
+    # Only make the request conditional if we still have the body to fall back on
+    headers = {}
+    if cache_key in _etags and os.path.exists(cached_body_path):
+        headers['If-None-Match'] = _etags[cache_key]
+
+    for attempt in range(MAX_RETRIES + 1):
+        async with limiter.concurrency:
+            await limiter.wait()
+            response = await client.get(url, params=params, headers=headers)
+
+        if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            break
+
+        # Back off outside the limiter so other requests can keep going
+        delay = get_retry_delay(response, attempt)
+        tqdm.write(f"Got {response.status_code} from {response.url}, retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+    # Not modified, reuse the body we saved last time (checked first, httpx treats 304 as an error)
+    if response.status_code == 304:
+        with gzip.open(cached_body_path, 'rb') as f:
+            return f.read()
+
+    response.raise_for_status()
+
+    # response.content is already decompressed, this just makes sure compression was negotiated
+    if not response.headers.get('Content-Encoding'):
+        tqdm.write(f"Warning: {response.url} was not sent compressed")
+
+    etag = response.headers.get('ETag')
+    if etag:
+        os.makedirs(SCRAPE_CACHE_DIR, exist_ok=True)
+        with gzip.open(cached_body_path, 'wb') as f:
+            f.write(response.content)
+        _etags[cache_key] = etag
+
+    return response.content
 
-def get_best_picture_nominations():
+async def get_best_picture_nominations(client, limiter):
     """Scrape the Oscar Best Picture page for all winners and nominees."""
     url = "https://en.wikipedia.org/wiki/Academy_Award_for_Best_Picture"
 
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-
     print(f"Fetching {url}...")
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
+    content = await fetch(client, limiter, url)
 
-    soup = BeautifulSoup(response.content, 'html.parser')
-    movies = []
+    return parse_best_picture_nominations(content)
 
-    # Stop words that indicate we've reached the statistics section
-    stop_phrases = [
-        "Production companies and distributors with multiple nominations and wins",
-        "production company",
-        "distributor"
-    ]
+def parse_best_picture_nominations(content):
+    """Parse all winners and nominees out of the Oscar Best Picture page's HTML."""
+    # Keep only wikitables and the section headings that precede them
+    soup = BeautifulSoup(content, 'lxml', parse_only=NOMINATIONS_STRAINER)
+    movies = []
 
     # Find all tables that contain nomination information
     tables = soup.find_all('table', class_='wikitable')
@@ -34,16 +191,15 @@ def get_best_picture_nominations():
         # Check if this table or preceding heading contains stop phrases
         prev_elements = []
         current = table.find_previous_sibling()
-        # Check up to 3 previous siblings for headings
-        for _ in range(3):
-            if current:
+        # Check up to 3 previous siblings for headings (earlier tables are siblings too, skip them)
+        while current and len(prev_elements) < 3:
+            if current.name != 'table':
                 prev_elements.append(current)
-                current = current.find_previous_sibling()
+            current = current.find_previous_sibling()
 
         should_stop = False
         for element in prev_elements:
-            element_text = element.get_text().lower()
-            if any(phrase.lower() in element_text for phrase in stop_phrases):
+            if STOP_RE.search(element.get_text()):
                 should_stop = True
                 break
 
@@ -52,10 +208,8 @@ def get_best_picture_nominations():
 
         # Also check the table caption
         caption = table.find('caption')
-        if caption:
-            caption_text = caption.get_text().lower()
-            if any(phrase.lower() in caption_text for phrase in stop_phrases):
-                break
+        if caption and STOP_RE.search(caption.get_text()):
+            break
 
         # Check first header row for production company indicators
         first_row = table.find('tr')
@@ -75,9 +229,9 @@ def get_best_picture_nominations():
             if year_th:
                 year_text = year_th.get_text(strip=True)
                 # Extract year from text like "2010" or "2010 (83rd)"
-                year_parts = ''.join(filter(str.isdigit, year_text.split('\n')[0]))
-                if year_parts and len(year_parts) >= 4:
-                    current_year = year_parts[:4]
+                year_match = YEAR_RE.search(year_text)
+                if year_match:
+                    current_year = year_match.group(1)
 
             if len(cells) == 0:
                 continue
@@ -91,7 +245,7 @@ def get_best_picture_nominations():
             if len(cells) >= 2:
                 # Check if first cell looks like a year (all digits)
                 first_cell_text = cells[0].get_text(strip=True)
-                if first_cell_text and first_cell_text.replace('/', '').replace('(', '').replace(')', '').isdigit():
+                if NUMERIC_CELL_RE.match(first_cell_text):
                     # First cell is year, film is second cell
                     film_cell = cells[1]
                 else:
@@ -128,33 +282,56 @@ def get_best_picture_nominations():
 
     return movies
 
-def extract_plot_from_section(soup, section_name):
-    """Helper function to extract plot text given a section name."""
-    plot_section = None
+def extract_plot_from_sections(soup, section_names):
+    """Extract plot text from the first of the given sections that has any, in priority order."""
+    # Lowercase the section names once instead of per heading
+    lowered_names = [name.lower() for name in section_names]
+    headings = {}
 
-    # Look for heading divs or h2/h3 tags with the section name
+    # Look for heading divs or h2/h3 tags with the section names, in a single pass
     for element in soup.find_all(['div', 'h2', 'h3']):
-        if element.name == 'div' and 'mw-heading' in element.get('class', []):
-            # Check if this heading contains the section name
-            heading_text = element.get_text()
-            if section_name.lower() in heading_text.lower():
-                plot_section = element
-                break
-        elif element.name in ['h2', 'h3']:
-            if section_name.lower() in element.get_text().lower():
-                plot_section = element
-                break
+        if element.name == 'div':
+            element_classes = element.get('class', [])
+            if 'mw-heading' not in element_classes:
+                continue
 
-    if not plot_section:
-        return None
+        heading_text = element.get_text().lower()
+        if not any(name in heading_text for name in lowered_names):
+            continue
+
+        for name in lowered_names:
+            if name not in headings and name in heading_text:
+                headings[name] = element
+
+        if len(headings) == len(lowered_names):
+            break
+
+    # Try each section in order, falling back when it is missing or empty
+    for name in lowered_names:
+        if name in headings:
+            plot_text = extract_plot_from_section(headings[name])
+            if plot_text:
+                return plot_text
 
+    return None
+
+def extract_plot_from_section(plot_section):
+    """Helper function to extract plot text following a section heading."""
     # Extract all paragraphs after the plot heading until the next main section
     plot_text = []
+    total_len = 0
     current = plot_section.find_next_sibling()
 
     while current:
+        class_set = set(current.get('class', []) or [])
+
+        # Skip references and non-printing templates without reading their text
+        if 'reference' in class_set or 'noprint' in class_set:
+            current = current.find_next_sibling()
+            continue
+
         # Stop at next main section heading (h2 level)
-        if current.name == 'div' and 'mw-heading' in current.get('class', []):
+        if current.name == 'div' and 'mw-heading' in class_set:
             # Check if this is an h2 level heading (main section)
             h2_in_div = current.find('h2')
             if h2_in_div:
@@ -169,52 +346,93 @@ def extract_plot_from_section(soup, section_name):
             if text:
                 plot_text.append(text)
 
+                # We already have the whole plot, no need to walk the rest of the page
+                total_len += len(text)
+                if total_len > MAX_PLOT_LENGTH:
+                    break
+
         current = current.find_next_sibling()
 
     return ' '.join(plot_text) if plot_text else None
 
 
-def extract_plot(movie_url):
-    """Extract the plot section from a movie's Wikipedia page."""
-    print(f"  Fetching plot from {movie_url}...")
+def extract_plot_from_html(content):
+    """Extract the plot section from a movie page's raw HTML (top-level so it can run in a process pool)."""
+    soup = BeautifulSoup(content, 'lxml', parse_only=PLOT_STRAINER)
 
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+    # Try "Plot" first, and if not found or empty, try "Synopsis"
+    return extract_plot_from_sections(soup, PLOT_SECTIONS)
 
-    try:
-        response = requests.get(movie_url, headers=headers)
-        response.raise_for_status()
+async def parse_api(client, limiter, title, **params):
+    """Call the Wikipedia parse API for a page and return the parse result."""
+    content = await fetch(client, limiter, WIKI_API_URL, params={
+        'action': 'parse',
+        'page': title,
+        'redirects': 1,
+        'format': 'json',
+        'formatversion': 2,
+        **params
+    })
 
-        soup = BeautifulSoup(response.content, 'html.parser')
+    data = orjson.loads(content)
+    if 'error' in data:
+        raise ValueError(data['error'].get('info', data['error']))
 
-        # Try "Plot" first
-        plot_text = extract_plot_from_section(soup, "Plot")
+    return data['parse']
 
-        # If Plot not found or empty, try "Synopsis"
-        if not plot_text:
-            plot_text = extract_plot_from_section(soup, "Synopsis")
+async def fetch_plot(client, limiter, movie_url, parse_pool):
+    """Fetch a movie's plot section from Wikipedia and extract its text."""
+    try:
+        title = unquote(movie_url.rsplit('/wiki/', 1)[1])
+
+        # Find the index of the first Plot and Synopsis sections
+        sections = (await parse_api(client, limiter, title, prop='sections'))['sections']
+        section_indexes = {}
+        for section in sections:
+            line = section['line'].lower()
+            for name in PLOT_SECTIONS:
+                if name not in section_indexes and name in line:
+                    section_indexes[name] = section['index']
+
+        # Try "Plot" first, and if not found or empty, try "Synopsis"
+        plot_text = None
+        for name in PLOT_SECTIONS:
+            if name not in section_indexes:
+                continue
 
-        if not plot_text:
-            print(f"    No plot or synopsis section found")
-            return None
+            # Only the section's HTML comes back, a small fraction of the full page
+            section = await parse_api(client, limiter, title, prop='text', section=section_indexes[name])
+
+            # Parse in another process so the GIL-bound soup work doesn't stall the downloads,
+            # only the final plot string has to be sent back
+            loop = asyncio.get_running_loop()
+            plot_text = await loop.run_in_executor(parse_pool, extract_plot_from_html, section['text'])
+            if plot_text:
+                break
 
-        return plot_text
+        # Movies without a plot are reported together once scraping is done
+        return plot_text or None
 
     except Exception as e:
-        print(f"    Error fetching plot: {e}")
+        tqdm.write(f"Error fetching plot from {movie_url}: {e}")
         return None
 
 def get_movie_filepath(movie_title, movie_year, output_dir='movie_data'):
     """Generate filepath for a movie JSON file."""
-    safe_title = "".join(c for c in movie_title if c.isalnum() or c in (' ', '-', '_')).strip()
+    safe_title = UNSAFE_FILENAME_RE.sub('', movie_title).strip()
     safe_title = safe_title.replace(' ', '_')
     filename = f"{movie_year}_{safe_title}.json"
     return os.path.join(output_dir, filename)
 
-def movie_already_scraped(movie_title, movie_year, output_dir='movie_data'):
+def list_existing_files(output_dir='movie_data'):
+    """List the files already in the output directory, read once up front."""
+    return frozenset(os.listdir(output_dir)) if os.path.isdir(output_dir) else frozenset()
+
+def movie_already_scraped(movie_title, movie_year, output_dir='movie_data', existing=None):
     """Check if a movie has already been scraped."""
     filepath = get_movie_filepath(movie_title, movie_year, output_dir)
+    if existing is not None:
+        return os.path.basename(filepath) in existing
     return os.path.exists(filepath)
 
 def save_movie_to_json(movie_data, output_dir='movie_data'):
@@ -223,12 +441,10 @@ def save_movie_to_json(movie_data, output_dir='movie_data'):
 
     filepath = get_movie_filepath(movie_data['name'], movie_data.get('year'), output_dir)
 
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(movie_data, f, indent=2, ensure_ascii=False)
-
-    print(f"  Saved to {filepath}")
+    with open(filepath, 'wb') as f:
+        f.write(orjson.dumps(movie_data, option=orjson.OPT_INDENT_2))
 
-def backfill_wiki_links(movies, output_dir='movie_data'):
+def backfill_wiki_links(movies, output_dir='movie_data', existing=None):
     """Add wiki links to existing JSON files that don't have them."""
     print("\nBackfilling wiki links to existing files...")
     updated = 0
@@ -236,7 +452,7 @@ def backfill_wiki_links(movies, output_dir='movie_data'):
     for movie in movies:
         filepath = get_movie_filepath(movie['title'], movie['year'], output_dir)
 
-        if os.path.exists(filepath):
+        if movie_already_scraped(movie['title'], movie['year'], output_dir, existing):
             with open(filepath, 'r', encoding='utf-8') as f:
                 movie_data = json.load(f)
 
@@ -244,59 +460,136 @@ def backfill_wiki_links(movies, output_dir='movie_data'):
             if 'wiki' not in movie_data:
                 movie_data['wiki'] = movie['url']
 
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(movie_data, f, indent=2, ensure_ascii=False)
+                with open(filepath, 'wb') as f:
+                    f.write(orjson.dumps(movie_data, option=orjson.OPT_INDENT_2))
 
                 print(f"  Updated {filepath}")
                 updated += 1
 
     print(f"Backfilled {updated} files with wiki links")
 
-def main():
+def load_checkpointed_nominations():
+    """Load the nomination list from the checkpoint if it is recent enough."""
+    if not os.path.exists(NOMINATIONS_CHECKPOINT):
+        return None
+
+    with open(NOMINATIONS_CHECKPOINT, 'rb') as f:
+        checkpoint = orjson.loads(f.read())
+
+    fetched_at = datetime.fromisoformat(checkpoint['fetched_at'])
+    if datetime.now(timezone.utc) - fetched_at > NOMINATIONS_MAX_AGE:
+        return None
+
+    return checkpoint['movies']
+
+def save_checkpointed_nominations(movies):
+    """Save the nomination list to the checkpoint with a UTC timestamp."""
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+
+    checkpoint = {
+        'fetched_at': datetime.now(timezone.utc).isoformat(),
+        'movies': movies
+    }
+
+    with open(NOMINATIONS_CHECKPOINT, 'wb') as f:
+        f.write(orjson.dumps(checkpoint))
+
+def load_done_files():
+    """Load the filenames of movies finished by previous runs."""
+    if not os.path.exists(DONE_CHECKPOINT):
+        return set()
+
+    with open(DONE_CHECKPOINT, 'r', encoding='utf-8') as f:
+        return {line.strip() for line in f if line.strip()}
+
+async def process_movie(movie, client, limiter, parse_pool):
+    """Scrape and save a single movie, returning a status dict."""
+    plot = await fetch_plot(client, limiter, movie['url'], parse_pool)
+
+    if not plot:
+        return {'status': 'no_plot', 'movie': movie}
+
+    movie_data = {
+        'year': movie['year'],
+        'name': movie['title'],
+        'plot': plot,
+        'wiki': movie['url']
+    }
+    save_movie_to_json(movie_data)
+
+    return {'status': 'success', 'movie': movie}
+
+async def scrape():
     print("Starting Oscar Best Picture scraper...\n")
 
-    # Get all nominations
-    movies = get_best_picture_nominations()
-    print(f"\nFound {len(movies)} movie links\n")
+    # Parse pages in a separate pool of processes, one per core
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as parse_pool:
+        async with create_client() as client:
+            # A fresh limiter per run, its semaphores belong to this event loop
+            limiter = RateLimiter()
+            load_etags()
+            # Get all nominations, reusing the checkpointed list from a recent run
+            movies = load_checkpointed_nominations()
+            if movies is None:
+                movies = await get_best_picture_nominations(client, limiter)
+                save_checkpointed_nominations(movies)
+            else:
+                print(f"Using checkpointed nominations from {NOMINATIONS_CHECKPOINT}")
+            print(f"\nFound {len(movies)} movie links\n")
+
+            # List existing files once instead of checking each movie on disk
+            existing = list_existing_files()
+            done = load_done_files()
+
+            # Backfill wiki links for existing files
+            backfill_wiki_links(movies, existing=existing)
+
+            # Process each movie
+            processed = 0
+            skipped = 0
+            no_plot_found = []
+
+            to_scrape = []
+            for movie in movies:
+                # Check if already scraped, either by a checkpointed run or on disk
+                filename = os.path.basename(get_movie_filepath(movie['title'], movie['year']))
+                if filename in done or movie_already_scraped(movie['title'], movie['year'], existing=existing):
+                    skipped += 1
+                else:
+                    to_scrape.append(movie)
 
-    # Backfill wiki links for existing files
-    backfill_wiki_links(movies)
+            print(f"Skipping {skipped} already scraped movies, scraping {len(to_scrape)}\n")
 
-    # Process each movie
-    processed = 0
-    skipped = 0
-    no_plot_found = []
+            # Scrape movies concurrently, the limiter in fetch() keeps this polite
+            tasks = [process_movie(movie, client, limiter, parse_pool) for movie in to_scrape]
 
-    for i, movie in enumerate(movies, 1):
-        print(f"[{i}/{len(movies)}] Processing: {movie['title']}")
+            os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+            with open(DONE_CHECKPOINT, 'a', encoding='utf-8') as done_file:
+                # A single progress bar updated from here instead of a print per movie
+                for task in tqdm(asyncio.as_completed(tasks), total=len(to_scrape)):
+                    result = await task
+                    movie = result['movie']
 
-        # Check if already scraped
-        if movie_already_scraped(movie['title'], movie['year']):
-            print(f"  Already scraped, skipping...")
-            skipped += 1
-            continue
+                    if result['status'] == 'success':
+                        processed += 1
+
+                        # Record progress, syncing to disk every few movies
+                        done_file.write(os.path.basename(get_movie_filepath(movie['title'], movie['year'])) + '\n')
+                        if processed % DONE_FSYNC_EVERY == 0:
+                            done_file.flush()
+                            os.fsync(done_file.fileno())
+                    else:
+                        # Track movies without plots
+                        no_plot_found.append({
+                            'title': movie['title'],
+                            'year': movie['year'],
+                            'url': movie['url']
+                        })
 
-        plot = extract_plot(movie['url'])
-
-        if plot:
-            movie_data = {
-                'year': movie['year'],
-                'name': movie['title'],
-                'plot': plot,
-                'wiki': movie['url']
-            }
-            save_movie_to_json(movie_data)
-            processed += 1
-        else:
-            # Track movies without plots
-            no_plot_found.append({
-                'title': movie['title'],
-                'year': movie['year'],
-                'url': movie['url']
-            })
-
-        # Be respectful to Wikipedia servers
-        time.sleep(1)
+                done_file.flush()
+                os.fsync(done_file.fileno())
+
+            save_etags()
 
     print(f"\n✓ Done! Processed {processed} new movies, skipped {skipped} existing movies.")
 
@@ -309,5 +602,8 @@ def main():
     else:
         print("\n✓ All movies had plots!")
 
+def main():
+    asyncio.run(scrape())
+
 if __name__ == "__main__":
     main()
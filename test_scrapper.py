@@ -0,0 +1,53 @@
+import httpx
+
+from scrapper import (
+    MAX_RETRY_DELAY, NUMERIC_CELL_RE, RETRY_BACKOFF, get_retry_delay, parse_best_picture_nominations
+)
+
+# Trimmed-down Best Picture page: a decade of nominees followed by the statistics section
+BEST_PICTURE_HTML = b"""
+<html><body><div class="mw-content-ltr mw-parser-output">
+<div class="mw-heading mw-heading3"><h3 id="1920s">1920s</h3></div>
+<table class="wikitable sortable">
+<tr><th>Year</th><th>Film</th><th>Producer(s)</th></tr>
+<tr><th rowspan="2">1927/28 (1st)</th><td><a href="/wiki/Wings_(1927_film)">Wings</a></td><td>Paramount</td></tr>
+<tr><td><a href="/wiki/The_Racket_(1928_film)">The Racket</a></td><td>The Caddo Company</td></tr>
+</table>
+<div class="mw-heading mw-heading2"><h2 id="Stats">Production companies and distributors with multiple nominations and wins</h2></div>
+<table class="wikitable">
+<tr><th>Company</th><th>Wins</th></tr>
+<tr><td><a href="/wiki/Paramount_Pictures">Paramount Pictures</a></td><td>14</td></tr>
+</table>
+</div></body></html>
+"""
+
+def test_nominee_tables_with_extra_classes_are_parsed():
+    movies = parse_best_picture_nominations(BEST_PICTURE_HTML)
+
+    assert movies[:2] == [
+        {'year': '1927', 'title': 'Wings', 'url': 'https://en.wikipedia.org/wiki/Wings_(1927_film)'},
+        {'year': '1927', 'title': 'The Racket', 'url': 'https://en.wikipedia.org/wiki/The_Racket_(1928_film)'},
+    ]
+
+def test_stats_heading_stops_table_loop():
+    movies = parse_best_picture_nominations(BEST_PICTURE_HTML)
+
+    assert [movie['title'] for movie in movies] == ['Wings', 'The Racket']
+
+def test_retry_delay_backs_off_exponentially():
+    response = httpx.Response(503)
+
+    assert [get_retry_delay(response, attempt) for attempt in range(3)] == [
+        RETRY_BACKOFF, RETRY_BACKOFF * 2, RETRY_BACKOFF * 4
+    ]
+
+def test_retry_delay_honours_retry_after():
+    assert get_retry_delay(httpx.Response(429, headers={'Retry-After': '7'}), 0) == 7
+    assert get_retry_delay(httpx.Response(429, headers={'Retry-After': '3600'}), 0) == MAX_RETRY_DELAY
+    assert get_retry_delay(httpx.Response(429, headers={'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}), 0) == 0
+
+def test_numeric_cell_requires_a_digit():
+    for text in ['2010', '1927/28', '(12)']:
+        assert NUMERIC_CELL_RE.match(text)
+    for text in ['', '/', '()', '(1st)', '2010 (83rd)']:
+        assert not NUMERIC_CELL_RE.match(text)